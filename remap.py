@@ -12,21 +12,31 @@ Usage:
 
 Where:
     "$mapping_file" is the path to a file containing the chromosome mappings.
+
+Performance:
+    For headers with a very large number of @SQ lines, either build the optional
+    Cython module (cythonize -i -3 remap_fast.pyx), which is picked up automatically,
+    or run the script under PyPy (pypy3 remap.py "$mapping_file") so the per-line
+    loop is JIT-compiled.
 """
 
 import sys
-import re
-import argparse
 from typing import Dict
 
+try:
+    # Optional compiled hot loop, see remap_fast.pyx
+    import remap_fast
+except ImportError:
+    remap_fast = None
+
 
 class ChromosomeRemapper:
     """
     A class to handle the remapping of chromosome names in BAM file headers based on a provided mapping file.
     """
 
-    # Compile the regular expression pattern once for efficiency
-    SN_TAG_PATTERN = re.compile(r'\bSN:(\S+)')
+    # Number of header lines buffered before each write to stdout
+    WRITE_BATCH_SIZE = 1024
 
     def __init__(self, mapping_file: str):
         """
@@ -36,26 +46,39 @@ class ChromosomeRemapper:
             mapping_file (str): Path to the chromosome mapping file.
         """
         self.mapping_file = mapping_file
-        self.mapping_dict = self.load_chromosome_mappings()
-
-    def load_chromosome_mappings(self) -> Dict[str, str]:
+        # Identity mappings never change a line, so only the renaming entries are kept
+        self.mapping_dict = {
+            original: remapped
+            for original, remapped in self.load_chromosome_mappings().items()
+            if original != remapped
+        }
+        # Preformatted SN fields, so the hot path never has to build them per line
+        self.sn_replacements = {
+            b"SN:" + original: b"SN:" + remapped for original, remapped in self.mapping_dict.items()
+        }
+
+    def load_chromosome_mappings(self) -> Dict[bytes, bytes]:
         """
         Load chromosome mappings from a file into a dictionary.
         Retain the original chromosome name if the mapping value is absent.
+        The file is read in binary mode and names are kept as bytes, so neither the
+        mapping file nor the header lines ever go through a text codec.
 
         Returns:
-            Dict[str, str]: A dictionary with original chromosome names as keys and remapped names as values.
+            Dict[bytes, bytes]: A dictionary with original chromosome names as keys and remapped names as values.
         """
         mapping = {}
         try:
-            with open(self.mapping_file, "r") as file:
+            with open(self.mapping_file, "rb") as file:
                 for line_number, line in enumerate(file, start=1):
-                    parts = line.strip().split("\t")
-                    if not parts or len(parts[0].strip()) == 0:
+                    # partition avoids building a list of every column per line
+                    original, _, rest = line.strip().partition(b"\t")
+                    if len(original.strip()) == 0:
                         # Skip empty or invalid lines
                         continue
-                    original = parts[0]
-                    remapped = parts[1] if len(parts) > 1 and parts[1].strip() else original
+                    remapped = rest.partition(b"\t")[0]
+                    if not remapped.strip():
+                        remapped = original
                     mapping[original] = remapped
         except FileNotFoundError:
             print(f"Error: File '{self.mapping_file}' not found.", file=sys.stderr)
@@ -68,74 +91,94 @@ class ChromosomeRemapper:
             sys.exit(1)
         return mapping
 
-    def replace_sn(self, match: re.Match) -> str:
-        """
-        Replacement function for SN tag using regex substitution.
-
-        Args:
-            match (re.Match): The regex match object.
-
-        Returns:
-            str: The replaced SN tag with remapped chromosome name.
-        """
-        original_chrom = match.group(1)
-        remapped_chrom = self.mapping_dict.get(original_chrom, original_chrom)
-        return f"SN:{remapped_chrom}"
-
-    def remap_chromosome_in_line(self, line: str) -> str:
+    def remap_chromosome_in_line(self, line: bytes) -> bytes:
         """
         Remap chromosome name in the given line using the provided mapping dictionary.
 
+        The SN field of an @SQ line is a literal tab-delimited token, so it is located
+        with bytes.find and looked up directly instead of going through a regex
+        substitution or splitting the line into fields.
+
         Args:
-            line (str): A single line from the BAM header.
+            line (bytes): A single raw line from the BAM header, including its line ending.
 
         Returns:
-            str: The line with the chromosome name remapped if applicable.
+            bytes: The line with the chromosome name remapped if applicable.
         """
-        if line.startswith("@SQ"):
-            # Substitute only the SN tag using the replace_sn callback
-            remapped_line = self.SN_TAG_PATTERN.sub(self.replace_sn, line)
-            return remapped_line
+        if line.startswith(b"@SQ"):
+            start = line.find(b"\tSN:")
+            if start == -1:
+                return line
+            start += 1
+            end = line.find(b"\t", start)
+            if end == -1:
+                # SN is the last field, so it ends where the line ending begins
+                end = len(line.rstrip(b"\r\n"))
+            remapped_field = self.sn_replacements.get(line[start:end])
+            if remapped_field is None:
+                # Unmapped or identity-mapped chromosome: hand back the original object
+                return line
+            return line[:start] + remapped_field + line[end:]
         return line
 
     def process_genomic_data(self):
         """
         Process each line of the input BAM header and remap chromosome names.
-        """
-        for line_number, header_line in enumerate(sys.stdin, start=1):
-            header_line = header_line.rstrip('\n')
-            remapped_line = self.remap_chromosome_in_line(header_line)
-            print(remapped_line)
 
-
-def parse_arguments() -> argparse.Namespace:
+        Lines are read and written as raw bytes and flushed in batches, avoiding the
+        text codec and a print call per line. The compiled loop from remap_fast is used
+        when it is available.
+        """
+        if remap_fast is not None:
+            remap_fast.remap_stream(
+                sys.stdin.buffer, sys.stdout.buffer, self.sn_replacements, self.WRITE_BATCH_SIZE
+            )
+            return
+
+        # Bind everything used in the loop to locals to avoid attribute lookups per line
+        remap_line = self.remap_chromosome_in_line
+        writelines = sys.stdout.buffer.writelines
+        batch_size = self.WRITE_BATCH_SIZE
+        batch = []
+        append = batch.append
+        for header_line in sys.stdin.buffer:
+            if header_line[:3] != b"@SQ":
+                # @HD, @RG, @PG and @CO lines are passed through untouched
+                append(header_line)
+            else:
+                append(remap_line(header_line))
+            if len(batch) >= batch_size:
+                writelines(batch)
+                batch.clear()
+        writelines(batch)
+
+
+def parse_arguments() -> str:
     """
     Parse command-line arguments.
 
+    The script takes a single positional argument, so sys.argv is read directly
+    rather than paying the startup cost of importing and building an argparse parser.
+
     Returns:
-        argparse.Namespace: Parsed command-line arguments.
+        str: Path to the chromosome mapping file.
     """
-    parser = argparse.ArgumentParser(
-        description=(
-            "Remap chromosome names in BAM file headers based on a provided mapping file.\n\n"
-            "Usage:\n"
-            "  samtools view -H <input.bam> | python remap.py <mapping_file> | samtools reheader - <input.bam> > <output.bam>"
-        ),
-        formatter_class=argparse.RawDescriptionHelpFormatter
-    )
-    parser.add_argument(
-        "mapping_file",
-        help="Path to the chromosome mapping file."
-    )
-    return parser.parse_args()
+    args = sys.argv[1:]
+    if "-h" in args or "--help" in args:
+        print(__doc__)
+        sys.exit(0)
+    if len(args) != 1:
+        print("Usage: python remap.py <mapping_file>", file=sys.stderr)
+        sys.exit(2)
+    return args[0]
 
 
 def main():
     """
     Main function to execute the chromosome remapping process.
     """
-    args = parse_arguments()
-    remapper = ChromosomeRemapper(args.mapping_file)
+    mapping_file = parse_arguments()
+    remapper = ChromosomeRemapper(mapping_file)
     remapper.process_genomic_data()
 
 
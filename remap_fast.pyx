@@ -0,0 +1,79 @@
+# cython: language_level=3
+"""
+Compiled hot loop for remap.py
+
+Optional Cython build of the per-line remapping loop, for headers with a very large
+number of @SQ lines. The SN field is located by scanning the raw line buffer with
+memchr instead of through bytes methods. remap.py uses it automatically when it has
+been built and falls back to the pure Python loop otherwise; test_remap_fast.py
+checks that both paths produce the same output.
+
+Build:
+    cythonize -i -3 remap_fast.pyx
+"""
+
+from libc.string cimport memchr
+
+
+cpdef bytes remap_line(bytes line, dict sn_replacements):
+    """
+    Remap the SN field of a single raw @SQ line.
+
+    Args:
+        line (bytes): A single raw line from the BAM header, including its line ending.
+        sn_replacements (dict): Preformatted b"SN:<original>" -> b"SN:<remapped>" fields.
+
+    Returns:
+        bytes: The line with the chromosome name remapped if applicable.
+    """
+    cdef const char* buf = line
+    cdef Py_ssize_t length = len(line)
+    cdef Py_ssize_t start, end
+    cdef const char* tab
+    cdef object remapped_field
+
+    if length < 3 or buf[0] != b'@' or buf[1] != b'S' or buf[2] != b'Q':
+        return line
+    # Ignore the line ending so a trailing SN field does not include it
+    while length > 0 and (buf[length - 1] == b'\n' or buf[length - 1] == b'\r'):
+        length -= 1
+
+    # Find the first tab-delimited field starting with "SN:"
+    start = 0
+    while True:
+        tab = <const char*>memchr(buf + start, b'\t', length - start)
+        if tab == NULL:
+            return line
+        start = tab - buf + 1
+        if (length - start >= 3 and buf[start] == b'S' and buf[start + 1] == b'N'
+                and buf[start + 2] == b':'):
+            break
+
+    tab = <const char*>memchr(buf + start, b'\t', length - start)
+    end = length if tab == NULL else tab - buf
+
+    remapped_field = sn_replacements.get(line[start:end])
+    if remapped_field is None:
+        return line
+    return line[:start] + remapped_field + line[end:]
+
+
+def remap_stream(infile, outfile, dict sn_replacements, Py_ssize_t batch_size):
+    """
+    Remap every line of a binary header stream and write the result in batches.
+
+    Args:
+        infile: Binary stream to read header lines from.
+        outfile: Binary stream to write remapped lines to.
+        sn_replacements (dict): Preformatted b"SN:<original>" -> b"SN:<remapped>" fields.
+        batch_size (int): Number of lines buffered before each write.
+    """
+    cdef list batch = []
+    cdef bytes line
+    writelines = outfile.writelines
+    for line in infile:
+        batch.append(remap_line(line, sn_replacements))
+        if len(batch) >= batch_size:
+            writelines(batch)
+            del batch[:]
+    writelines(batch)
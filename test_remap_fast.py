@@ -0,0 +1,83 @@
+"""
+Check that the compiled remap_fast module and the pure Python path in remap.py
+produce identical output. Skipped when remap_fast has not been built.
+
+Run:
+    python -m unittest test_remap_fast
+"""
+
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import remap
+
+MAPPING = (
+    b"chr1\t1\n"
+    b"chr2\t2\n"
+    b"chrM\tMT\n"
+    b"chrUn_x\tchrUn_x\n"
+    b"chrEmpty\t\n"
+    b"\n"
+)
+
+HEADER_LINES = [
+    b"@HD\tVN:1.6\tSO:coordinate\n",
+    b"@SQ\tSN:chr1\tLN:248956422\n",
+    b"@SQ\tSN:chr2\tLN:242193529\tM5:f98db672eb0993dcfdabafe2a882905c\n",
+    b"@SQ\tSN:chrM\tLN:16569\r\n",
+    b"@SQ\tSN:chrUn_x\tLN:5\n",
+    b"@SQ\tSN:chrEmpty\tLN:5\n",
+    b"@SQ\tSN:other\tLN:5\n",
+    b"@SQ\tLN:7\tSN:chr1\n",
+    b"@SQ\tLN:7\tSN:chr2",
+    b"@SQ\tLN:7\tSN:\n",
+    b"@SQ\tLN:7\n",
+    b"@SQ\n",
+    b"@SQ",
+    b"@S\n",
+    b"@SQ\tAS:SN:chr1\tSN:chr1\n",
+    b"@RG\tID:x\tSM:chr1\n",
+    b"@PG\tID:bwa\tCL:bwa mem SN:chr1\n",
+    b"\n",
+    b"",
+]
+
+
+@unittest.skipIf(remap.remap_fast is None, "remap_fast has not been built")
+class CompiledMatchesPythonTest(unittest.TestCase):
+    def setUp(self):
+        with tempfile.NamedTemporaryFile("wb", suffix=".tsv", delete=False) as file:
+            file.write(MAPPING)
+        self.addCleanup(os.remove, file.name)
+        self.remapper = remap.ChromosomeRemapper(file.name)
+
+    def run_process(self, header: bytes, use_compiled: bool) -> bytes:
+        stdin = io.TextIOWrapper(io.BytesIO(header))
+        stdout = io.TextIOWrapper(io.BytesIO())
+        fast_module = remap.remap_fast if use_compiled else None
+        with mock.patch.object(remap, "remap_fast", fast_module), \
+                mock.patch.object(sys, "stdin", stdin), \
+                mock.patch.object(sys, "stdout", stdout):
+            self.remapper.process_genomic_data()
+        stdout.flush()
+        return stdout.buffer.getvalue()
+
+    def test_remap_line(self):
+        for line in HEADER_LINES:
+            with self.subTest(line=line):
+                self.assertEqual(
+                    remap.remap_fast.remap_line(line, self.remapper.sn_replacements),
+                    self.remapper.remap_chromosome_in_line(line),
+                )
+
+    def test_process_genomic_data(self):
+        header = b"".join(HEADER_LINES) * (self.remapper.WRITE_BATCH_SIZE // len(HEADER_LINES) + 2)
+        self.assertEqual(self.run_process(header, True), self.run_process(header, False))
+
+
+if __name__ == "__main__":
+    unittest.main()